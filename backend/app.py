@@ -1,21 +1,35 @@
-from flask import Flask, request, jsonify, g, has_request_context
+from flask import Flask, request, jsonify, g
 from flask_cors import CORS
 from flask.json.provider import DefaultJSONProvider
 import os
-import numpy as np
+import io
+import shutil
+import tempfile
+import orjson
 import threading
-import uuid
+import contextvars
 import gc
 import torch
 import time
 from datetime import datetime
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import HTTPException
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 import logging
-from functools import wraps
+import queue
+import atexit
+from logging.handlers import QueueHandler, QueueListener
+from functools import wraps, lru_cache
 
 
-from mainPipeline import MedicalPipelineIntegrator
+from mainPipeline import MedicalPipelineIntegrator, release_shared_models
+
+# CUDA availability does not change while the process runs
+HAS_CUDA = torch.cuda.is_available()
+
+# Request id of the request being handled; 'system' during start-up, CLI, celery, etc.
+REQUEST_ID = contextvars.ContextVar("request_id", default="system")
 
 class RequestContextFilter(logging.Filter):
     """
@@ -24,79 +38,95 @@ class RequestContextFilter(logging.Filter):
     """
 
     def filter(self, record: logging.LogRecord) -> bool:
-        if has_request_context() and getattr(g, "request_id", None):
-            record.request_id = g.request_id
-        else:                       # during app start-up, CLI, celery, etc.
-            record.request_id = "system"
+        record.request_id = REQUEST_ID.get()
         return True
 
-class NumpyJSONProvider(DefaultJSONProvider):
-    """Custom JSON provider that handles NumPy data types for Flask 3.0+"""
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, which serializes NumPy types natively"""
     
-    def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, (np.float32, np.float64)):
-            return float(obj)
-        elif isinstance(obj, (np.int32, np.int64)):
-            return int(obj)
-        elif isinstance(obj, np.bool_):
-            return bool(obj)
-        
-        return super().default(obj)
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 class ThreadSafePipelineManager:
     """Thread-safe manager for medical AI pipeline instances"""
     
     def __init__(self):
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
         self._pipeline = None
-        self._last_used = None
         self._usage_count = 0
-        self._max_usage = 100
+        self._requests_since_cache_clear = 0
+        self._cache_clear_interval = 50
+        self._max_cached_slack = 512 * 1024 * 1024
         
     def get_pipeline(self):
-        """Get pipeline instance with thread safety and memory management"""
+        """Get the resident pipeline instance, creating it on first use"""
         with self._lock:
-            current_time = time.time()
-            
-            if (self._pipeline is None or 
-                self._usage_count >= self._max_usage or
-                (self._last_used and current_time - self._last_used > 3600)):
-                
-                if self._pipeline is not None:
-                    self._cleanup_pipeline()
-                
+            if self._pipeline is None:
                 logging.info("Initializing fresh medical pipeline instance")
                 self._pipeline = MedicalPipelineIntegrator()
                 self._usage_count = 0
             
-            self._last_used = current_time
             self._usage_count += 1
             return self._pipeline
     
+    def warm_up(self):
+        """Load the models before serving so the first request does not pay the cold start"""
+        with self._lock:
+            if self._pipeline is None:
+                logging.info("Warming up medical pipeline instance")
+                self._pipeline = MedicalPipelineIntegrator()
+                self._pipeline.load_models()
+    
+    def release_cuda_cache(self):
+        """Return cached CUDA blocks to the driver every N requests or when too much is held idle"""
+        if not HAS_CUDA:
+            return
+        
+        with self._lock:
+            self._requests_since_cache_clear += 1
+            cached_slack = torch.cuda.memory_reserved() - torch.cuda.memory_allocated()
+            
+            if (self._requests_since_cache_clear < self._cache_clear_interval and
+                cached_slack <= self._max_cached_slack):
+                return
+            
+            self._requests_since_cache_clear = 0
+        
+        logging.info(f"Releasing {cached_slack / 1024 / 1024:.2f} MB of cached CUDA memory")
+        torch.cuda.empty_cache()
+    
+    def cleanup(self):
+        """Tear down the pipeline while holding the lock"""
+        with self._lock:
+            self._cleanup_pipeline()
+    
     def _cleanup_pipeline(self):
-        """Clean up pipeline resources"""
+        """Clean up pipeline resources; caller must hold the lock"""
         logging.info("Cleaning up pipeline resources")
         
-        if hasattr(self._pipeline, 'transcriber'):
+        # Only models that were actually loaded; hasattr would trigger the lazy load
+        loaded = vars(self._pipeline) if self._pipeline is not None else {}
+        
+        if 'transcriber' in loaded:
             if hasattr(self._pipeline.transcriber, 'model'):
                 del self._pipeline.transcriber.model
         
-        if hasattr(self._pipeline, 'ner_system'):
+        if 'ner_system' in loaded:
             if hasattr(self._pipeline.ner_system, 'medical_ner_pipeline'):
                 del self._pipeline.ner_system.medical_ner_pipeline
-            if hasattr(self._pipeline.ner_system, 'medspacy_nlp'):
-                del self._pipeline.ner_system.medspacy_nlp
+            if hasattr(self._pipeline.ner_system, 'rules_automaton'):
+                del self._pipeline.ner_system.rules_automaton
         
         del self._pipeline
+        release_shared_models()
+        # Frozen objects are never collected; release them so the old models can be reclaimed
+        gc.unfreeze()
         gc.collect()
         
-        if torch.cuda.is_available():
+        if HAS_CUDA:
             torch.cuda.empty_cache()
             torch.cuda.synchronize()
         
@@ -104,7 +134,7 @@ class ThreadSafePipelineManager:
 
 # Setup logging FIRST - before creating Flask app
 def setup_logging():
-    """Setup logging configuration with proper filter"""
+    """Setup queue-based logging so request threads never block on log I/O"""
     
     # Create the filter
     log_filter = RequestContextFilter()
@@ -117,97 +147,158 @@ def setup_logging():
         '%(asctime)s - %(levelname)s - [%(request_id)s] %(message)s'
     )
     
-    # Create handlers
+    # Create handlers; these run on the listener thread
     file_handler = logging.FileHandler('medical_api.log')
     file_handler.setFormatter(file_formatter)
-    file_handler.addFilter(log_filter)
     
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(console_formatter)
-    console_handler.addFilter(log_filter)
+    
+    # Request threads only enqueue records. The filter sits on the queue
+    # handler so the request id is captured at emit time, not when the
+    # listener gets around to writing the record.
+    log_queue = queue.Queue(-1)
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.addFilter(log_filter)
+    
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
     
     # Configure root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
-    root_logger.addFilter(log_filter)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(queue_handler)
     
-    # Configure Werkzeug logger
+    # Werkzeug records propagate to the root queue handler
     werkzeug_logger = logging.getLogger('werkzeug')
     werkzeug_logger.handlers.clear()
-    werkzeug_logger.addFilter(log_filter)
-    werkzeug_logger.addHandler(file_handler)
-    werkzeug_logger.addHandler(console_handler)
     
     return log_filter
 
+def configure_torch_backends():
+    """Enable TF32 matmuls and the fused SDPA attention kernels for the CUDA models"""
+    if not HAS_CUDA:
+        return
+    
+    torch.backends.cuda.matmul.allow_tf32 = True
+    torch.backends.cudnn.allow_tf32 = True
+    torch.backends.cuda.enable_flash_sdp(True)
+    torch.backends.cuda.enable_mem_efficient_sdp(True)
+    torch.set_float32_matmul_precision('high')
+
 # Setup logging before everything else
 setup_logging()
+configure_torch_backends()
 
 # Global thread-safe pipeline manager
 pipeline_manager = ThreadSafePipelineManager()
 
+# Upload threads hand audio processing to this pool. The single shared pipeline holds one
+# Whisper model on one device, so jobs run one at a time however many GPUs are present
+INFERENCE_WORKERS = 1
+inference_executor = ThreadPoolExecutor(max_workers=INFERENCE_WORKERS, thread_name_prefix='pipeline')
+
 app = Flask(__name__)
 CORS(app, origins=["http://localhost:3001"])
 
 # Apply the custom JSON provider
-app.json = NumpyJSONProvider(app)
+app.json = OrjsonProvider(app)
 
 # Configuration
 app.config['MAX_CONTENT_LENGTH'] = 100 * 1024 * 1024
 UPLOAD_FOLDER = 'temp_uploads'
-ALLOWED_EXTENSIONS = {'wav', 'mp3', 'm4a', 'flac', 'ogg'}
+ALLOWED_EXTENSIONS = frozenset({'wav', 'mp3', 'm4a', 'flac', 'ogg'})
+_ALLOWED_DOTTED = frozenset('.' + ext for ext in ALLOWED_EXTENSIONS)
+_ALLOWED_ERROR = f'File type not allowed. Supported formats: {", ".join(sorted(ALLOWED_EXTENSIONS))}'
 
 # Create upload directory
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
 def allowed_file(filename):
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return os.path.splitext(filename)[1].lower() in _ALLOWED_DOTTED
+
+def save_upload(file, dst):
+    """Copy an uploaded file into an open binary file, using sendfile when the upload is backed by a real file"""
+    src = file.stream
+    
+    # Werkzeug spools uploads into a SpooledTemporaryFile, whose fileno() would force an
+    # in-memory upload over to disk. Look at the wrapped file instead: _file is private
+    # to SpooledTemporaryFile, so anything but a real file there means a plain copy.
+    real_file = src
+    if isinstance(src, tempfile.SpooledTemporaryFile):
+        real_file = getattr(src, '_file', None)
+        if real_file is None or isinstance(real_file, io.BytesIO):
+            real_file = None
+    
+    src_fd = None
+    if real_file is not None:
+        try:
+            src_fd = real_file.fileno()
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            src_fd = None
+    
+    if src_fd is not None and hasattr(os, 'sendfile'):
+        offset = real_file.tell()
+        remaining = os.fstat(src_fd).st_size - offset
+        while remaining > 0:
+            sent = os.sendfile(dst.fileno(), src_fd, offset, remaining)
+            if sent == 0:
+                break
+            offset += sent
+            remaining -= sent
+    else:
+        shutil.copyfileobj(src, dst, length=1024 * 1024)
+
+def iso_now():
+    """Current local time as an ISO-8601 string for response bodies"""
+    return datetime.fromtimestamp(time.time()).isoformat()
+
+@lru_cache(maxsize=1)
+def _iso_for_second(second):
+    """ISO-8601 string for a whole second; cached so repeated health checks reuse it"""
+    return datetime.fromtimestamp(second).isoformat()
 
 def create_unique_session_id():
     """Generate a unique session ID for each request"""
-    return f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    return f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.urandom(4).hex()}"
 
 @contextmanager
 def request_memory_management():
     """Context manager for request-level memory management"""
     start_memory = None
     
-    if torch.cuda.is_available():
+    if HAS_CUDA:
         start_memory = torch.cuda.memory_allocated()
     
     try:
         yield
     finally:
-        gc.collect()
-        
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
+        if HAS_CUDA:
             end_memory = torch.cuda.memory_allocated()
             
             if start_memory is not None:
                 memory_diff = end_memory - start_memory
                 logging.info(f"Memory usage change: {memory_diff / 1024 / 1024:.2f} MB")
+        
+        pipeline_manager.release_cuda_cache()
 
 def log_request_info(f):
     """Decorator to log request information"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
         g.start_time = time.time()
-        g.request_id = uuid.uuid4().hex[:8]
         
-        logging.info(f"Request {g.request_id} started: {request.endpoint}")
+        logging.info(f"Request {REQUEST_ID.get()} started: {request.endpoint}")
         
         try:
             result = f(*args, **kwargs)
             duration = time.time() - g.start_time
-            logging.info(f"Request {g.request_id} completed in {duration:.2f}s")
+            logging.info(f"Request {REQUEST_ID.get()} completed in {duration:.2f}s")
             return result
         except Exception as e:
             duration = time.time() - g.start_time
-            logging.error(f"Request {g.request_id} failed after {duration:.2f}s: {str(e)}")
+            logging.error(f"Request {REQUEST_ID.get()} failed after {duration:.2f}s: {str(e)}")
             raise
     
     return decorated_function
@@ -216,36 +307,54 @@ def log_request_info(f):
 def before_request():
     """Initialize request-specific data"""
     g.start_time = time.time()
-    g.request_id = uuid.uuid4().hex[:8]
+    g.request_id_token = REQUEST_ID.set(os.urandom(4).hex())
 
 @app.after_request
 def after_request(response):
     """Clean up after each request"""
     if hasattr(g, 'start_time'):
         duration = time.time() - g.start_time
-        logging.info(f"Request {getattr(g, 'request_id', 'unknown')} total duration: {duration:.2f}s")
+        logging.info(f"Request {REQUEST_ID.get()} total duration: {duration:.2f}s")
+    
+    if hasattr(g, 'request_id_token'):
+        REQUEST_ID.reset(g.request_id_token)
     
-    gc.collect()
     return response
 
+@app.errorhandler(Exception)
+def handle_exception(e):
+    """Return unhandled endpoint errors as JSON; HTTP errors keep their own responses"""
+    if isinstance(e, HTTPException):
+        return e
+    
+    app.logger.error(f"Processing error in {request.endpoint}: {str(e)}")
+    return jsonify({
+        'success': False,
+        'error': str(e),
+        'request_id': REQUEST_ID.get(),
+        'timestamp': iso_now()
+    }), 500
+
 @app.route('/api/health', methods=['GET'])
 @log_request_info
 def health_check():
     """Health check endpoint with memory info"""
     memory_info = {}
     
-    if torch.cuda.is_available():
+    if HAS_CUDA:
+        reserved = f"{torch.cuda.memory_reserved() / 1024 / 1024:.2f} MB"
         memory_info = {
             'cuda_memory_allocated': f"{torch.cuda.memory_allocated() / 1024 / 1024:.2f} MB",
-            'cuda_memory_reserved': f"{torch.cuda.memory_reserved() / 1024 / 1024:.2f} MB",
-            'cuda_memory_cached': f"{torch.cuda.memory_cached() / 1024 / 1024:.2f} MB"
+            'cuda_memory_reserved': reserved,
+            # memory_cached() is a deprecated alias of memory_reserved()
+            'cuda_memory_cached': reserved
         }
     
     return jsonify({
         'status': 'healthy',
         'message': 'Medical AI Pipeline API is running',
-        'timestamp': datetime.now().isoformat(),
-        'request_id': getattr(g, 'request_id', 'unknown'),
+        'timestamp': _iso_for_second(int(time.time())),
+        'request_id': REQUEST_ID.get(),
         'memory_info': memory_info,
         'pipeline_usage_count': pipeline_manager._usage_count
     })
@@ -255,158 +364,125 @@ def health_check():
 def upload_and_process():
     """Upload audio file and process through medical AI pipeline"""
     with request_memory_management():
-        try:
-            if 'file' not in request.files:
-                return jsonify({'error': 'No file provided'}), 400
-            
-            file = request.files['file']
-            patient_id = request.form.get('patientId', None)
-            
-            if file.filename == '':
-                return jsonify({'error': 'No file selected'}), 400
-            
-            if not allowed_file(file.filename):
-                return jsonify({
-                    'error': f'File type not allowed. Supported formats: {", ".join(ALLOWED_EXTENSIONS)}'
-                }), 400
-            
-            # Create unique session and file identifiers
-            unique_session_id = create_unique_session_id()
-            filename = secure_filename(file.filename)
-            unique_filename = f"{unique_session_id}_{filename}"
-            file_path = os.path.join(UPLOAD_FOLDER, unique_filename)
-            
-            file.save(file_path)
-            
-            logging.info(f"Processing file: {filename} (Session: {unique_session_id})")
-            
-            # Get thread-safe pipeline instance
-            pipeline = pipeline_manager.get_pipeline()
-            
-            # Create unique patient ID for this session
-            session_patient_id = f"{patient_id}_{unique_session_id}" if patient_id else unique_session_id
-            
-            # Process through pipeline
-            result = pipeline.process_single_audio(file_path, patient_id=session_patient_id)
+        if 'file' not in request.files:
+            return jsonify({'error': 'No file provided'}), 400
         
-            
-            # Ensure result has unique session info
-            if 'session_info' in result:
-                result['session_info']['session_id'] = unique_session_id
-            
-            # Convert numpy types
-            result = convert_numpy_types(result)
-            
-            # Format response
-            response_data = {
-                'success': True,
-                'session_id': unique_session_id,
-                'request_id': g.request_id,
-                'processing_time': result.get('processing_time', 0),
-                'transcript': {
-                    'text': result.get('transcription', {}).get('text', ''),
-                    'word_count': result.get('transcription', {}).get('word_count', 0),
-                    'confidence': result.get('transcription', {}).get('confidence', 0),
-                    'duration': result.get('transcription', {}).get('duration', 0)
-                },
-                'entities': {
-                    'summary': result.get('entities', {}).get('entity_summary', {}),
-                    'total_count': result.get('entities', {}).get('total_entities', 0),
-                    'details': result.get('entities', {}).get('extracted_entities', {})
-                },
-                'triage': {
-                    'level': result.get('triage', {}).get('triage_level', 5),
-                    'priority': result.get('triage', {}).get('priority', 'NON-URGENT'),
-                    'color_code': result.get('triage', {}).get('color_code', 'BLUE'),
-                    'recommendation': result.get('triage', {}).get('recommendation'),
-                    'confidence': result.get('triage', {}).get('confidence', 'N/A')
-                },
-                'clinical_summary': result.get('clinical_summary', {}),
-                'timestamp': datetime.now().isoformat(),
-                'file_processed': filename
-            }
-            
-            logging.info(f"Successfully processed {filename} (Session: {unique_session_id})")
-            return jsonify(response_data)
-            
-        except Exception as e:
-            app.logger.error(f"Processing error for {file.filename if 'file' in locals() else 'unknown'}: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': str(e),
-                'request_id': getattr(g, 'request_id', 'unknown'),
-                'timestamp': datetime.now().isoformat()
-            }), 500
-
-def convert_numpy_types(obj):
-    """Recursively convert NumPy types to Python native types"""
-    if isinstance(obj, dict):
-        return {key: convert_numpy_types(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [convert_numpy_types(item) for item in obj]
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.floating):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, (np.float32, np.float64)):
-        return float(obj)
-    elif isinstance(obj, (np.int32, np.int64)):
-        return int(obj)
-    elif isinstance(obj, np.bool_):
-        return bool(obj)
-    else:
-        return obj
+        file = request.files['file']
+        patient_id = request.form.get('patientId', None)
+        
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({'error': _ALLOWED_ERROR}), 400
+        
+        # Create unique session and file identifiers
+        unique_session_id = create_unique_session_id()
+        filename = secure_filename(file.filename)
+        # Already checked against _ALLOWED_DOTTED; secure_filename may drop the dot from non-ASCII names
+        extension = os.path.splitext(file.filename)[1].lower()
+        
+        # The OS picks a collision-free name; the session prefix keeps uploads traceable
+        with tempfile.NamedTemporaryFile(dir=UPLOAD_FOLDER, prefix=f"{unique_session_id}_",
+                                         suffix=extension, delete=False) as upload_file:
+            save_upload(file, upload_file)
+            file_path = upload_file.name
+        
+        logging.info(f"Processing file: {filename} (Session: {unique_session_id})")
+        
+        # Get thread-safe pipeline instance
+        pipeline = pipeline_manager.get_pipeline()
+        
+        # Create unique patient ID for this session
+        session_patient_id = f"{patient_id}_{unique_session_id}" if patient_id else unique_session_id
+        
+        # Process through pipeline on the bounded inference pool, carrying the request id along
+        request_context = contextvars.copy_context()
+        result = inference_executor.submit(
+            request_context.run, pipeline.process_single_audio, file_path, patient_id=session_patient_id
+        ).result()
+        
+        # Ensure result has unique session info
+        if 'session_info' in result:
+            result['session_info']['session_id'] = unique_session_id
+        
+        # Pull each section out once; reuse the lists and dicts without copying
+        transcription = result.get('transcription') or {}
+        entities = result.get('entities') or {}
+        triage = result.get('triage') or {}
+        
+        # Format response
+        response_data = {
+            'success': True,
+            'session_id': unique_session_id,
+            'request_id': REQUEST_ID.get(),
+            'processing_time': result.get('processing_time', 0),
+            'transcript': {
+                'text': transcription.get('text', ''),
+                'word_count': transcription.get('word_count', 0),
+                'confidence': transcription.get('confidence', 0),
+                'duration': transcription.get('duration', 0)
+            },
+            'entities': {
+                'summary': entities.get('entity_summary', {}),
+                'total_count': entities.get('total_entities', 0),
+                'details': entities.get('extracted_entities', {})
+            },
+            'triage': {
+                'level': triage.get('triage_level', 5),
+                'priority': triage.get('priority', 'NON-URGENT'),
+                'color_code': triage.get('color_code', 'BLUE'),
+                'recommendation': triage.get('recommendation'),
+                'confidence': triage.get('confidence', 'N/A')
+            },
+            'clinical_summary': result.get('clinical_summary', {}),
+            'timestamp': iso_now(),
+            'file_processed': filename
+        }
+        
+        logging.info(f"Successfully processed {filename} (Session: {unique_session_id})")
+        return jsonify(response_data)
 
 @app.route('/api/reports/<session_id>', methods=['GET'])
 @log_request_info
 def get_report(session_id):
     """Get detailed report for a session"""
-    try:
-        return jsonify({
-            'session_id': session_id,
-            'status': 'completed',
-            'message': 'Report retrieved successfully',
-            'request_id': getattr(g, 'request_id', 'unknown')
-        })
-    except Exception as e:
-        return jsonify({
-            'error': str(e),
-            'request_id': getattr(g, 'request_id', 'unknown')
-        }), 500
+    return jsonify({
+        'session_id': session_id,
+        'status': 'completed',
+        'message': 'Report retrieved successfully',
+        'request_id': REQUEST_ID.get()
+    })
 
 @app.route('/api/memory/cleanup', methods=['POST'])
 @log_request_info
 def force_cleanup():
     """Force cleanup of model caches"""
-    try:
-        pipeline_manager._cleanup_pipeline()
-        
-        gc.collect()
-        if torch.cuda.is_available():
-            torch.cuda.empty_cache()
-            torch.cuda.synchronize()
-        
-        return jsonify({
-            'success': True,
-            'message': 'Memory cleanup completed',
-            'request_id': getattr(g, 'request_id', 'unknown'),
-            'timestamp': datetime.now().isoformat()
-        })
-    except Exception as e:
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'request_id': getattr(g, 'request_id', 'unknown')
-        }), 500
+    pipeline_manager.cleanup()
+    
+    return jsonify({
+        'success': True,
+        'message': 'Memory cleanup completed',
+        'request_id': REQUEST_ID.get(),
+        'timestamp': iso_now()
+    })
+
+def tune_garbage_collector():
+    """Move long-lived startup objects out of the GC scan set and raise the gen0 threshold"""
+    gc.collect(2)
+    gc.freeze()
+    
+    _, gen1_threshold, gen2_threshold = gc.get_threshold()
+    gc.set_threshold(50_000, gen1_threshold, gen2_threshold)
+
+def prepare_runtime():
+    """Warm the pipeline and tune the GC before serving; also called from gunicorn.conf.py"""
+    # Load models first so they are part of the frozen heap
+    pipeline_manager.warm_up()
+    tune_garbage_collector()
 
 if __name__ == '__main__':
-    # Set multiprocessing sharing strategy
-    if torch.cuda.is_available():
-        try:
-            torch.multiprocessing.set_sharing_strategy('file_system')
-        except:
-            pass
+    # Development entry point; production runs under gunicorn (see gunicorn.conf.py)
+    prepare_runtime()
     
-    app.run(debug=True, host='0.0.0.0', port=5000, threaded=True)
+    app.run(debug=False, host='0.0.0.0', port=5000, threaded=True)
@@ -0,0 +1,20 @@
+# Production server settings: gunicorn -c gunicorn.conf.py
+#
+# A single worker process keeps one copy of the models in GPU memory;
+# extra workers would each load their own. Concurrency comes from the
+# worker's threads instead.
+
+wsgi_app = "app:app"
+bind = "0.0.0.0:5000"
+worker_class = "gthread"
+workers = 1
+threads = 8
+
+# Transcribing a long recording can take minutes
+timeout = 600
+
+
+def post_worker_init(worker):
+    """Load models and freeze the heap once the worker has imported the app"""
+    from app import prepare_runtime
+    prepare_runtime()
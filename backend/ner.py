@@ -1,142 +1,435 @@
 from transformers import AutoTokenizer, AutoModelForTokenClassification, pipeline
-import medspacy
-from medspacy.ner import TargetRule
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+from types import MappingProxyType
+import torch
+import numpy as np
+import ahocorasick
 import warnings
 warnings.filterwarnings('ignore')
 
+# OpenVINO runtime for faster CPU inference; hosts without optimum-intel use the torch model
+try:
+    from optimum.intel import OVModelForTokenClassification
+except ImportError:
+    OVModelForTokenClassification = None
+
+# Entity mapping for standardization, shared read-only by every instance
+_ENTITY_MAP = MappingProxyType({
+    'CHEMICAL': 'MEDICATION',
+    'DISEASE': 'DISEASE',
+    'SYMPTOM': 'SYMPTOM',
+    'ANATOMY': 'ANATOMY',
+    'PROCEDURE': 'PROCEDURE',
+    'DRUG': 'MEDICATION',
+    'CONDITION': 'DISEASE',
+    'PER': 'OTHER',  # BioBERT might return these
+    'LOC': 'OTHER',
+    'ORG': 'OTHER'
+})
+
+
+# Phrases for the rule-based fallback, matched case-insensitively
+_FALLBACK_RULES = (
+    # Common medications
+    ("metformin", "MEDICATION"),
+    ("insulin", "MEDICATION"),
+    ("lisinopril", "MEDICATION"),
+    ("aspirin", "MEDICATION"),
+    ("ibuprofen", "MEDICATION"),
+    ("amlodipine", "MEDICATION"),
+    ("atorvastatin", "MEDICATION"),
+
+    # Common symptoms
+    ("chest pain", "SYMPTOM"),
+    ("shortness of breath", "SYMPTOM"),
+    ("fatigue", "SYMPTOM"),
+    ("nausea", "SYMPTOM"),
+    ("headache", "SYMPTOM"),
+    ("fever", "SYMPTOM"),
+    ("cough", "SYMPTOM"),
+    ("dizziness", "SYMPTOM"),
+    ("sweating", "SYMPTOM"),
+    ("weakness", "SYMPTOM"),
+
+    # Common diseases
+    ("diabetes", "DISEASE"),
+    ("hypertension", "DISEASE"),
+    ("pneumonia", "DISEASE"),
+    ("asthma", "DISEASE"),
+    ("depression", "DISEASE"),
+    ("anxiety", "DISEASE"),
+    ("malaria", "DISEASE"),
+
+    # Procedures
+    ("CT scan", "PROCEDURE"),
+    ("MRI", "PROCEDURE"),
+    ("X-ray", "PROCEDURE"),
+    ("blood test", "PROCEDURE"),
+    ("EKG", "PROCEDURE"),
+    ("echocardiogram", "PROCEDURE"),
+)
+
+
+class _SpanIndex:
+    """
+    Start/end offsets of the entities merged under one label. Small sets are checked
+    with a scalar loop; larger ones with a single NumPy interval comparison.
+    """
+    
+    # Below this many spans the NumPy call overhead outweighs the vectorized check
+    VECTOR_MIN_SPANS = 8
+    
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self._arrays = None
+    
+    def add(self, entity):
+        self.starts.append(entity['start'])
+        self.ends.append(entity['end'])
+        self._arrays = None
+    
+    def overlaps(self, entity):
+        """True if entity overlaps any indexed span"""
+        start, end = entity['start'], entity['end']
+        if len(self.starts) < self.VECTOR_MIN_SPANS:
+            return any(end > s and e > start for s, e in zip(self.starts, self.ends))
+        
+        # Arrays are rebuilt only after new spans were added
+        if self._arrays is None:
+            self._arrays = (np.array(self.starts, dtype=np.int32), np.array(self.ends, dtype=np.int32))
+        starts, ends = self._arrays
+        return bool(np.any((end > starts) & (ends > start)))
+
+
 class AdvancedMedicalNER:
     """
     Hybrid Medical NER combining BioBERT transformer model with rule-based fallback
     """
     
+    # Transformer outputs kept for repeated texts (identical transcripts or batch fragments)
+    ML_CACHE_SIZE = 256
+    
+    MODEL_NAME = "dmis-lab/biobert-v1.1"
+    
+    # Texts per transformer forward pass when the pipeline is given several inputs
+    BATCH_SIZE = 16
+    
+    # Converted OpenVINO model, exported on first start and reused afterwards
+    OPENVINO_MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "biobert-openvino")
+    
+    # BioBERT's 512-token limit minus the [CLS] and [SEP] tokens added per window
+    WINDOW_TOKENS = 510
+    
+    # Bump when the extraction code changes output in ways the settings don't capture,
+    # so entities persisted by older code stop matching
+    EXTRACTION_VERSION = 1
+    
+    # Process-wide model components, loaded once and shared by every instance.
+    # The tokenizer is cached separately so releasing the model keeps it loaded.
+    _shared_lock = threading.Lock()
+    _shared_tokenizer = None
+    _shared_model = None
+    _shared_pipeline = None
+    _shared_rules_automaton = None
+    
     def __init__(self):
+        # Response cache in front of the BioBERT forward pass, keyed by text digest
+        self._ml_cache = OrderedDict()
+        self._ml_cache_lock = threading.Lock()
+        
+        self._ensure_loaded()
+        
         # Use BioBERT that you're already loading
-        self.biobert_tokenizer = AutoTokenizer.from_pretrained("dmis-lab/biobert-v1.1")
-        self.biobert_model = AutoModelForTokenClassification.from_pretrained("dmis-lab/biobert-v1.1")
-        
-        # Create pipeline from loaded components
-        self.medical_ner_pipeline = pipeline(
-            "ner",
-            model=self.biobert_model,
-            tokenizer=self.biobert_tokenizer,
-            aggregation_strategy="simple"
-        )
+        self.biobert_tokenizer = self._shared_tokenizer
+        self.biobert_model = self._shared_model
+        self.medical_ner_pipeline = self._shared_pipeline
         
         # Keep rule-based system as fallback
-        self.medspacy_nlp = medspacy.load()
-        self.setup_fallback_rules()
-        
-        # Entity mapping for standardization
-        self.entity_mapping = {
-            'CHEMICAL': 'MEDICATION',
-            'DISEASE': 'DISEASE', 
-            'SYMPTOM': 'SYMPTOM',
-            'ANATOMY': 'ANATOMY',
-            'PROCEDURE': 'PROCEDURE',
-            'DRUG': 'MEDICATION',
-            'CONDITION': 'DISEASE',
-            'PER': 'OTHER',  # BioBERT might return these
-            'LOC': 'OTHER',
-            'ORG': 'OTHER'
-        }
+        self.rules_automaton = self._shared_rules_automaton
+        
+        # Identifies this extraction setup in persisted entity caches
+        self.config_fingerprint = self.compute_config_fingerprint()
     
-    def setup_fallback_rules(self):
-        """Setup rule-based fallback for entities not caught by ML model"""
-        rules = [
-            # Common medications
-            TargetRule("metformin", "MEDICATION"),
-            TargetRule("insulin", "MEDICATION"),
-            TargetRule("lisinopril", "MEDICATION"),
-            TargetRule("aspirin", "MEDICATION"),
-            TargetRule("ibuprofen", "MEDICATION"),
-            TargetRule("amlodipine", "MEDICATION"),
-            TargetRule("atorvastatin", "MEDICATION"),
-            
-            # Common symptoms
-            TargetRule("chest pain", "SYMPTOM"),
-            TargetRule("shortness of breath", "SYMPTOM"),
-            TargetRule("fatigue", "SYMPTOM"),
-            TargetRule("nausea", "SYMPTOM"),
-            TargetRule("headache", "SYMPTOM"),
-            TargetRule("fever", "SYMPTOM"),
-            TargetRule("cough", "SYMPTOM"),
-            TargetRule("dizziness", "SYMPTOM"),
-            TargetRule("sweating", "SYMPTOM"),
-            TargetRule("weakness", "SYMPTOM"),
-            
-            # Common diseases
-            TargetRule("diabetes", "DISEASE"),
-            TargetRule("hypertension", "DISEASE"),
-            TargetRule("pneumonia", "DISEASE"),
-            TargetRule("asthma", "DISEASE"),
-            TargetRule("depression", "DISEASE"),
-            TargetRule("anxiety", "DISEASE"),
-            TargetRule("malaria", "DISEASE"),
-            
-            # Procedures
-            TargetRule("CT scan", "PROCEDURE"),
-            TargetRule("MRI", "PROCEDURE"),
-            TargetRule("X-ray", "PROCEDURE"),
-            TargetRule("blood test", "PROCEDURE"),
-            TargetRule("EKG", "PROCEDURE"),
-            TargetRule("echocardiogram", "PROCEDURE"),
-        ]
-        
-        target_matcher = self.medspacy_nlp.get_pipe("medspacy_target_matcher")
-        target_matcher.add(rules)
-    
-    def extract_entities_ml(self, text):
-        """Extract entities using transformer model"""
+    @classmethod
+    def _ensure_loaded(cls):
+        """Load the shared tokenizer, model, NER pipeline and rule automaton once per process"""
+        with cls._shared_lock:
+            # Honour a shared (e.g. NFS-backed) hub cache when one is configured
+            cache_dir = os.environ.get("HUGGINGFACE_HUB_CACHE")
+            
+            if cls._shared_tokenizer is None:
+                cls._shared_tokenizer = AutoTokenizer.from_pretrained(cls.MODEL_NAME, cache_dir=cache_dir)
+            
+            if cls._shared_model is None:
+                if OVModelForTokenClassification is not None and not torch.cuda.is_available():
+                    cls._shared_model = cls._load_openvino_model(cache_dir)
+                if cls._shared_model is None:
+                    model = AutoModelForTokenClassification.from_pretrained(cls.MODEL_NAME, cache_dir=cache_dir)
+                    if not torch.cuda.is_available():
+                        # INT8 Linear layers: smaller weights and faster CPU matmuls
+                        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+                    cls._shared_model = model
+                cls._shared_pipeline = None
+            
+            # Create pipeline from loaded components
+            if cls._shared_pipeline is None:
+                pipeline_kwargs = {}
+                if isinstance(cls._shared_model, torch.nn.Module):
+                    # OpenVINO models pick their own device; torch models need one
+                    pipeline_kwargs['device'] = 0 if torch.cuda.is_available() else -1
+                
+                cls._shared_pipeline = pipeline(
+                    "ner",
+                    model=cls._shared_model,
+                    tokenizer=cls._shared_tokenizer,
+                    aggregation_strategy="simple",
+                    batch_size=cls.BATCH_SIZE,
+                    **pipeline_kwargs
+                )
+            
+            if cls._shared_rules_automaton is None:
+                cls._shared_rules_automaton = cls.setup_fallback_rules()
+    
+    @classmethod
+    def _load_openvino_model(cls, cache_dir):
+        """Load the exported OpenVINO model, converting and saving it on first use; None on failure"""
         try:
-            # Clear any cached states first
-            if hasattr(self.medical_ner_pipeline.model, '_past'):
+            if os.path.isdir(cls.OPENVINO_MODEL_DIR):
+                return OVModelForTokenClassification.from_pretrained(cls.OPENVINO_MODEL_DIR)
+            
+            model = OVModelForTokenClassification.from_pretrained(cls.MODEL_NAME, export=True, cache_dir=cache_dir)
+            model.save_pretrained(cls.OPENVINO_MODEL_DIR)
+            return model
+        except Exception as e:
+            print(f"OpenVINO model unavailable, using PyTorch BioBERT: {e}")
+            return None
+    
+    @classmethod
+    def release_shared_models(cls):
+        """Drop the shared model, pipeline and rule automaton; the tokenizer stays cached"""
+        with cls._shared_lock:
+            cls._shared_model = None
+            cls._shared_pipeline = None
+            cls._shared_rules_automaton = None
+    
+    @staticmethod
+    def setup_fallback_rules():
+        """
+        Setup rule-based fallback for entities not caught by ML model.
+        All phrases are compiled into one case-insensitive Aho-Corasick automaton.
+        """
+        automaton = ahocorasick.Automaton()
+        for phrase, label in _FALLBACK_RULES:
+            automaton.add_word(phrase.lower(), (len(phrase), label))
+        automaton.make_automaton()
+        return automaton
+    
+    def model_backend(self):
+        """Inference backend of the loaded BioBERT model"""
+        if not isinstance(self.biobert_model, torch.nn.Module):
+            return 'openvino'
+        return 'torch-cuda' if torch.cuda.is_available() else 'torch-cpu-int8'
+    
+    def compute_config_fingerprint(self):
+        """SHA-256 hex digest of everything that shapes extracted entities apart from the text"""
+        config = (
+            self.EXTRACTION_VERSION,
+            self.MODEL_NAME,
+            self.model_backend(),
+            self.WINDOW_TOKENS,
+            sorted(_ENTITY_MAP.items()),
+            _FALLBACK_RULES
+        )
+        return hashlib.sha256(repr(config).encode('utf-8')).hexdigest()
+    
+    def _ml_cache_key(self, text, text_digest=None):
+        """Callers that already hashed the text pass its SHA-256 hex digest to skip a second pass"""
+        return text_digest or hashlib.sha256(text.encode('utf-8')).hexdigest()
+    
+    def _get_cached_ml(self, cache_key):
+        """Return copies of cached transformer entities, or None on a miss"""
+        with self._ml_cache_lock:
+            cached = self._ml_cache.get(cache_key)
+            if cached is not None:
+                self._ml_cache.move_to_end(cache_key)
+        if cached is None:
+            return None
+        # Fresh dicts so callers can't mutate the cached entries
+        return [dict(entity) for entity in cached]
+    
+    def _store_cached_ml(self, cache_key, formatted_entities):
+        """Cache transformer entities, evicting the least recently used entry when full"""
+        with self._ml_cache_lock:
+            self._ml_cache[cache_key] = tuple(dict(entity) for entity in formatted_entities)
+            if len(self._ml_cache) > self.ML_CACHE_SIZE:
+                self._ml_cache.popitem(last=False)
+    
+    def _reset_model_state(self):
+        """Clear any cached states on the transformer model"""
+        try:
+            if hasattr(self, 'medical_ner_pipeline') and hasattr(self.medical_ner_pipeline.model, '_past'):
                 self.medical_ner_pipeline.model._past = {}
+        except:
+            pass
+    
+    def split_into_windows(self, text):
+        """
+        Split text into consecutive windows of at most WINDOW_TOKENS BioBERT tokens,
+        returned as (char_offset, window_text). Window ends are moved back to a word
+        boundary so no word is split across two windows.
+        """
+        encoding = self.biobert_tokenizer(text, add_special_tokens=False, return_offsets_mapping=True)
+        offsets = encoding['offset_mapping']
+        if len(offsets) <= self.WINDOW_TOKENS:
+            return [(0, text)]
+        
+        windows = []
+        start = 0
+        while start < len(offsets):
+            end = min(start + self.WINDOW_TOKENS, len(offsets))
+            if end < len(offsets):
+                # Back off while the next token continues the current word
+                boundary = end
+                while boundary > start + 1 and offsets[boundary][0] == offsets[boundary - 1][1]:
+                    boundary -= 1
+                if boundary > start + 1:
+                    end = boundary
+            
+            char_start, char_end = offsets[start][0], offsets[end - 1][1]
+            windows.append((char_start, text[char_start:char_end]))
+            start = end
+        
+        return windows
+    
+    def run_ml_pipeline(self, texts):
+        """
+        Run BioBERT over texts in one pipeline call, chunking long texts into token
+        windows and mapping the entity offsets back onto the original text
+        """
+        windows = []
+        for index, text in enumerate(texts):
+            windows.extend((index, offset, window) for offset, window in self.split_into_windows(text))
+        
+        # The pipeline groups the windows into batches of its configured batch_size
+        outputs = self.medical_ner_pipeline([window for _, _, window in windows])
+        
+        results = [[] for _ in texts]
+        seen = [set() for _ in texts]
+        for (index, offset, _), ml_entities in zip(windows, outputs):
+            for entity in self.format_ml_entities(ml_entities, offset):
+                key = (entity['start'], entity['end'], entity['label'])
+                if key not in seen[index]:
+                    seen[index].add(key)
+                    results[index].append(entity)
+        
+        return results
+    
+    def format_ml_entities(self, ml_entities, offset=0):
+        """Convert raw HF pipeline output into the pipeline's entity dicts, shifting spans by offset"""
+        formatted_entities = []
+        for entity in ml_entities:
+            # Clean up entity text
+            entity_text = entity['word'].replace('##', '').strip()
+            if len(entity_text) < 2:  # Skip very short entities
+                continue
+                
+            formatted_entities.append({
+                'text': entity_text,
+                'label': _ENTITY_MAP.get(entity['entity_group'], 'OTHER'),
+                'confidence': float(entity['score']),  # Ensure it's a Python float
+                'start': int(entity['start']) + offset,
+                'end': int(entity['end']) + offset,
+                'source': 'transformer'
+            })
+        
+        return formatted_entities
+    
+    def extract_entities_ml(self, text, text_digest=None):
+        """Extract entities using transformer model, reusing cached results for repeated text"""
+        cache_key = self._ml_cache_key(text, text_digest)
+        cached = self._get_cached_ml(cache_key)
+        if cached is not None:
+            return cached
+        
+        try:
+            self._reset_model_state()
             
             # Use the medical NER model
-            ml_entities = self.medical_ner_pipeline(text)
-            
-            # Format entities
-            formatted_entities = []
-            for entity in ml_entities:
-                # Clean up entity text
-                entity_text = entity['word'].replace('##', '').strip()
-                if len(entity_text) < 2:  # Skip very short entities
-                    continue
-                    
-                formatted_entities.append({
-                    'text': entity_text,
-                    'label': self.entity_mapping.get(entity['entity_group'], 'OTHER'),
-                    'confidence': float(entity['score']),  # Ensure it's a Python float
-                    'start': int(entity['start']),
-                    'end': int(entity['end']),
-                    'source': 'transformer'
-                })
+            formatted_entities = self.run_ml_pipeline([text])[0]
+            self._store_cached_ml(cache_key, formatted_entities)
             
             return formatted_entities
             
         except Exception as e:
             print(f"ML extraction failed: {e}")
-            # Safe cache clearing
-            try:
-                if hasattr(self, 'medical_ner_pipeline') and hasattr(self.medical_ner_pipeline.model, '_past'):
-                    self.medical_ner_pipeline.model._past = {}
-            except:
-                pass
+            self._reset_model_state()
             return []
     
+    def extract_entities_ml_batch(self, texts, text_digests=None):
+        """
+        Extract transformer entities for several texts, batching the forward
+        passes for texts that are not already cached. Results follow input order.
+        """
+        text_digests = text_digests or [None] * len(texts)
+        cache_keys = [self._ml_cache_key(text, digest) for text, digest in zip(texts, text_digests)]
+        results = [self._get_cached_ml(cache_key) for cache_key in cache_keys]
+        
+        pending = [i for i, cached in enumerate(results) if cached is None]
+        if not pending:
+            return results
+        
+        try:
+            self._reset_model_state()
+            
+            outputs = self.run_ml_pipeline([texts[i] for i in pending])
+            for i, formatted_entities in zip(pending, outputs):
+                results[i] = formatted_entities
+                self._store_cached_ml(cache_keys[i], formatted_entities)
+            
+        except Exception as e:
+            print(f"Batched ML extraction failed, falling back to single texts: {e}")
+            self._reset_model_state()
+            for i in pending:
+                results[i] = self.extract_entities_ml(texts[i], cache_keys[i])
+        
+        return results
+    
     def extract_entities_rules(self, text):
         """Extract entities using rule-based system"""
         try:
-            doc = self.medspacy_nlp(text)
-            rule_entities = []
+            # Lowercase per character when a full lower() would shift offsets
+            text_lower = text.lower()
+            if len(text_lower) != len(text):
+                text_lower = ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+            
+            # Whole-word matches only, as the token-based matcher did
+            matches = []
+            for end_index, (length, label) in self.rules_automaton.iter(text_lower):
+                start, end = end_index + 1 - length, end_index + 1
+                if (start == 0 or not text_lower[start - 1].isalnum()) and \
+                        (end == len(text_lower) or not text_lower[end].isalnum()):
+                    matches.append((start, end, label))
             
-            for ent in doc.ents:
+            # Keep the longest of overlapping matches, earliest first on ties
+            matches.sort(key=lambda match: (match[0] - match[1], match[0]))
+            taken = []
+            for start, end, label in matches:
+                if all(end <= s or e <= start for s, e, _ in taken):
+                    taken.append((start, end, label))
+            taken.sort()
+            
+            rule_entities = []
+            for start, end, label in taken:
                 rule_entities.append({
-                    'text': ent.text.strip(),
-                    'label': ent.label_,
+                    'text': text[start:end],
+                    'label': label,
                     'confidence': 1.0,  # Rule-based has perfect confidence
-                    'start': ent.start_char,
-                    'end': ent.end_char,
+                    'start': start,
+                    'end': end,
                     'source': 'rule-based'
                 })
             
@@ -156,45 +449,35 @@ class AdvancedMedicalNER:
             'ANATOMY': []
         }
         
+        spans = {label: _SpanIndex() for label in entities}
+        
         # Add high-confidence ML entities first
         for entity in ml_entities:
             if entity['confidence'] > 0.7:  # High confidence threshold
                 label = entity['label']
                 if label in entities:
                     entities[label].append(entity)
+                    spans[label].add(entity)
         
         # Add rule-based entities that don't overlap
         for rule_entity in rule_entities:
-            # Check for overlap with existing ML entities
-            overlaps = False
-            for label in entities:
-                for ml_entity in entities[label]:
-                    if self.entities_overlap(rule_entity, ml_entity):
-                        overlaps = True
-                        break
-                if overlaps:
-                    break
+            # Check for overlap with existing entities of any label
+            overlaps = any(index.overlaps(rule_entity) for index in spans.values())
             
             # Add if no overlap
             if not overlaps:
                 label = rule_entity['label']
                 if label in entities:
                     entities[label].append(rule_entity)
+                    spans[label].add(rule_entity)
         
         # Add lower confidence ML entities that don't overlap
         for entity in ml_entities:
             if entity['confidence'] <= 0.7:  # Lower confidence
                 label = entity['label']
-                if label in entities:
-                    # Check for overlap
-                    overlaps = False
-                    for existing in entities[label]:
-                        if self.entities_overlap(entity, existing):
-                            overlaps = True
-                            break
-                    
-                    if not overlaps:
-                        entities[label].append(entity)
+                if label in entities and not spans[label].overlaps(entity):
+                    entities[label].append(entity)
+                    spans[label].add(entity)
         
         return entities
     
@@ -202,20 +485,18 @@ class AdvancedMedicalNER:
         """Check if two entities overlap in text position"""
         return not (entity1['end'] <= entity2['start'] or entity2['end'] <= entity1['start'])
     
-    def extract_entities(self, text):
-        """Main method: Extract entities using hybrid approach"""
-        if not text or not text.strip():
-            print("Empty text provided to NER")
-            return {
-                'SYMPTOM': [],
-                'MEDICATION': [],
-                'DISEASE': [],
-                'PROCEDURE': [],
-                'ANATOMY': []
-            }
-        
-        # Extract using both methods
-        ml_entities = self.extract_entities_ml(text)
+    def empty_entities(self):
+        """Entity result with every category present and empty"""
+        return {
+            'SYMPTOM': [],
+            'MEDICATION': [],
+            'DISEASE': [],
+            'PROCEDURE': [],
+            'ANATOMY': []
+        }
+    
+    def combine_entities(self, text, ml_entities):
+        """Add rule-based entities to the transformer entities and merge them"""
         rule_entities = self.extract_entities_rules(text)
         
         # Merge and return
@@ -232,3 +513,31 @@ class AdvancedMedicalNER:
         print(f"  Final merged entities: {total_merged}")
         
         return merged_entities
+    
+    def extract_entities(self, text, text_digest=None):
+        """Main method: Extract entities using hybrid approach"""
+        if not text or not text.strip():
+            print("Empty text provided to NER")
+            return self.empty_entities()
+        
+        # Extract using both methods
+        return self.combine_entities(text, self.extract_entities_ml(text, text_digest))
+    
+    def extract_entities_batch(self, texts, text_digests=None):
+        """Extract entities for several texts with batched transformer inference"""
+        text_digests = text_digests or [None] * len(texts)
+        results = [None] * len(texts)
+        
+        batch = [i for i, text in enumerate(texts) if text and text.strip()]
+        ml_results = self.extract_entities_ml_batch(
+            [texts[i] for i in batch], [text_digests[i] for i in batch]
+        )
+        for i, ml_entities in zip(batch, ml_results):
+            results[i] = self.combine_entities(texts[i], ml_entities)
+        
+        for i, merged in enumerate(results):
+            if merged is None:
+                print("Empty text provided to NER")
+                results[i] = self.empty_entities()
+        
+        return results
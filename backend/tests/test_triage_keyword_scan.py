@@ -0,0 +1,65 @@
+import random
+
+import pytest
+
+import triageSystem
+from triageSystem import ESITriageSystem
+
+SCOPES = ('SYMPTOM', 'DISEASE', 'MEDICATION')
+FILLER = ('patient', 'reports', 'the', 'and', 'no', 'mild', 'café', 'straße', 'naïve', 'ünresponsive', '')
+
+
+def criteria_phrases(triage):
+    """Every keyword phrase the automaton was built from"""
+    phrases = []
+    for criteria in (triage.level_1_criteria, triage.level_2_criteria, triage.level_3_criteria,
+                     triage.level_4_criteria, triage.level_5_criteria):
+        for value in criteria.values():
+            if isinstance(value, list):
+                phrases.extend(value)
+    return phrases
+
+
+def random_texts(rng, vocabulary):
+    """A lowercased transcript plus up to five entity texts, with their scopes"""
+    texts = [' '.join(rng.choice(vocabulary) for _ in range(rng.randint(0, 8))).lower()]
+    scopes = ['transcript']
+    for _ in range(rng.randint(0, 5)):
+        texts.append(' '.join(rng.choice(vocabulary) for _ in range(rng.randint(1, 3))).lower())
+        scopes.append(rng.choice(SCOPES))
+    return texts, scopes
+
+
+def test_hyperscan_scan_matches_aho_corasick():
+    pytest.importorskip('hyperscan')
+    
+    triage = ESITriageSystem()
+    assert triage.keyword_database is not None
+    
+    # A second instance with the Hyperscan database switched off scans with the automaton
+    automaton_only = ESITriageSystem()
+    automaton_only.keyword_database = None
+    
+    rng = random.Random(0)
+    vocabulary = criteria_phrases(triage) + list(FILLER)
+    for _ in range(5000):
+        texts, scopes = random_texts(rng, vocabulary)
+        assert triage.scan_keyword_level(texts, scopes) == automaton_only.scan_keyword_level(texts, scopes), (texts, scopes)
+
+
+def test_keyword_scan_respects_scopes():
+    triage = ESITriageSystem()
+    
+    # 'chest pain' is a level-2 symptom and transcript phrase, but not a medication
+    assert triage.scan_keyword_level(['', 'chest pain'], ['transcript', 'SYMPTOM']) == 2
+    assert triage.scan_keyword_level(['', 'chest pain'], ['transcript', 'MEDICATION']) == 5
+    # Phrases never match across the NUL separator between texts
+    assert triage.scan_keyword_level(['chest', 'pain'], ['transcript', 'SYMPTOM']) == 5
+
+
+def test_keyword_scan_falls_back_without_hyperscan(monkeypatch):
+    monkeypatch.setattr(triageSystem, 'hyperscan', None)
+    triage = ESITriageSystem()
+    
+    assert triage.keyword_database is None
+    assert triage.scan_keyword_level(['patient is in cardiac arrest'], ['transcript']) == 1
@@ -0,0 +1,80 @@
+import pytest
+
+from triageSystem import ESITriageSystem
+
+
+@pytest.fixture(scope='module')
+def triage():
+    return ESITriageSystem()
+
+
+@pytest.mark.parametrize('transcript', [
+    'respiratory rate 6',
+    'resp rate is 44',
+    'respirations of 50 per minute',
+    'rr 4',
+])
+def test_critical_respiratory_rate(triage, transcript):
+    assert triage.check_critical_vitals(transcript)
+
+
+@pytest.mark.parametrize('transcript', [
+    'respiratory rate 16',
+    'rr 8',
+    'respirations 40',
+])
+def test_normal_respiratory_rate(triage, transcript):
+    assert not triage.check_critical_vitals(transcript)
+
+
+@pytest.mark.parametrize('transcript', [
+    'temp 41.5',          # Celsius, 106.7 F
+    'temperature 107',    # Fahrenheit
+    'temp of 106.2',
+])
+def test_critical_temperature(triage, transcript):
+    assert triage.check_critical_vitals(transcript)
+
+
+@pytest.mark.parametrize('transcript', [
+    'temp 38.5',
+    'temperature 98.6',
+    'temp 41',            # 105.8 F, just under the threshold
+    'temperature 105.9',
+    'temp 20',            # implausible in either unit
+    'temp 50',
+    'temp 150',
+    'temperature 999',
+])
+def test_non_critical_or_implausible_temperature(triage, transcript):
+    assert not triage.check_critical_vitals(transcript)
+
+
+def test_critical_vitals_escalate_to_level_1(triage):
+    assert triage.assess_esi_level({}, 'Patient febrile, temp 42, otherwise alert')['triage_level'] == 1
+    assert triage.assess_esi_level({}, 'Respiratory rate 5 and shallow')['triage_level'] == 1
+    assert triage.assess_esi_level({}, 'Temp 150 noted on the chart')['triage_level'] == 5
+
+
+@pytest.mark.parametrize('transcript', [
+    'bp 60/40',
+    'blood pressure is 65/30',
+    'pressure dropped to 50/30',
+])
+def test_critical_blood_pressure(triage, transcript):
+    assert triage.check_critical_vitals(transcript)
+
+
+@pytest.mark.parametrize('transcript', [
+    'take 1/2 tablet twice a day',
+    'rated pain 8/10',
+    'pain is 10/10',
+    'bp 0/0',
+    'blood pressure 120/80',
+])
+def test_fractions_and_normal_pressures_are_not_critical(triage, transcript):
+    assert not triage.check_critical_vitals(transcript)
+
+
+def test_pain_score_does_not_escalate(triage):
+    assert triage.assess_esi_level({}, 'Ankle sprain, rated pain 8/10, took 1/2 tablet')['triage_level'] != 1
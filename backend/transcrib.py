@@ -1,12 +1,23 @@
 import warnings
 import os
+import threading
 warnings.filterwarnings('ignore', category=UserWarning)
 
+import torch
 import whisper
 
 class MedicalTranscriber:
-    def __init__(self, model_size="base"):
-        self.model = whisper.load_model(model_size)
+    def __init__(self, model_size="base", language=None, task="transcribe"):
+        self.use_cuda = torch.cuda.is_available()
+        self.model = whisper.load_model(model_size, device="cuda" if self.use_cuda else "cpu")
+        
+        # A fixed language skips Whisper's detection pass over the first 30 seconds
+        self.language = language
+        self.task = task
+        
+        # Whisper installs kv-cache hooks on the shared decoder for every decode, so two
+        # concurrent transcriptions on one model would mix each other's tokens
+        self._decode_lock = threading.Lock()
 
     def transcribe_audio(self, audio_path: str) -> dict:
         """Transcribe audio file and return structured result"""
@@ -16,14 +27,21 @@ class MedicalTranscriber:
                 raise ValueError(f"Audio file not found: {audio_path}")
             
             print(f"Processing audio file: {audio_path}")
-            result = self.model.transcribe(audio_path)
-            
-            # Safe cache reset - only if method exists
-            try:
-                if hasattr(self.model, 'decoder') and hasattr(self.model.decoder, 'reset'):
-                    self.model.decoder.reset()
-            except AttributeError:
-                pass  # Skip if reset method doesn't exist
+            with self._decode_lock:
+                result = self.model.transcribe(
+                    audio_path,
+                    language=self.language,
+                    task=self.task,
+                    fp16=self.use_cuda,  # Half precision on GPU; fp16 on CPU only triggers a warning
+                    condition_on_previous_text=False  # Shorter decoder prompts and no repetition loops
+                )
+                
+                # Safe cache reset - only if method exists
+                try:
+                    if hasattr(self.model, 'decoder') and hasattr(self.model.decoder, 'reset'):
+                        self.model.decoder.reset()
+                except AttributeError:
+                    pass  # Skip if reset method doesn't exist
             
             transcribed_text = result['text']
             print(f"Transcription completed: {len(transcribed_text)} characters")
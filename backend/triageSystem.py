@@ -1,11 +1,59 @@
 import re
+import ahocorasick
+import logging
 import warnings
 warnings.filterwarnings('ignore', category=UserWarning)
 
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict
+from typing import Dict, List, Tuple
+import bisect
 import hashlib
-import uuid
+import threading
+import itertools
+import os
+
+# Optional SIMD multi-pattern matcher for high-throughput hosts; pyahocorasick otherwise
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+logger = logging.getLogger(__name__)
+
+# Vital sign mentions, matched in a single pass. The systolic value is the last named
+# group in its alternative so match.lastgroup identifies the vital; a bare "x/y" counts
+# as a blood pressure reading unless its systolic value is implausibly low.
+_VITALS_RE = re.compile(
+    r'(?:\b(?:blood pressure|bp)\D{0,20})?(?P<sbp>\d{1,3})/\d{1,3}'
+    r'|\b(?:heart rate|pulse|hr)\b\D{0,20}?(?P<hr>\d{1,3})'
+    r'|\b(?:oxygen saturation|o2 sat|spo2)\D{0,20}?(?P<o2>\d{1,3})'
+    r'|\b(?:respiratory rate|resp rate|respirations|rr)\b\D{0,20}?(?P<rr>\d{1,3})'
+    r'|\b(?:temperature|temp)\b\D{0,20}?(?P<temp>\d{2,3}(?:\.\d+)?)'
+)
+# Lower systolic readings are fractions or scores ("1/2 tablet", "pain 8/10"), not pressures
+_MIN_PLAUSIBLE_SYSTOLIC = 40
+
+# Plausible body temperatures per unit; transcribed readings outside both are ignored
+_CELSIUS_RANGE = (30.0, 45.0)
+_FAHRENHEIT_RANGE = (86.0, 113.0)
+_AGE_RE = re.compile(r'(\d+)\s*(?:year|yr)s?\s*old|age\s*(?:is\s*)?(\d+)')
+_ELDERLY_CONCERNING_TERMS = ('chest pain', 'shortness of breath', 'confusion', 'fall')
+
+# Entity labels whose texts are matched against their own keyword lists
+_ENTITY_KEYWORD_SCOPES = ('SYMPTOM', 'DISEASE', 'MEDICATION')
+
+# ESI level -> (priority, color, recommendation, wait time)
+_ESI_LEVEL_RESPONSES = {
+    # ESI Algorithm Step 1: Does the patient require immediate life-saving intervention?
+    1: ('IMMEDIATE', 'RED', 'Immediate life-saving intervention required', '0 minutes'),
+    # ESI Algorithm Step 2: Is this a high-risk situation?
+    2: ('EMERGENT', 'ORANGE', 'High-risk situation - should not wait', '≤10 minutes'),
+    # ESI Algorithm Steps 3-4: How many resources will the patient consume?
+    3: ('URGENT', 'YELLOW', 'Many resources needed - urgent care', '≤30 minutes'),
+    4: ('LESS URGENT', 'GREEN', 'One resource needed - less urgent', '≤60 minutes'),
+    5: ('NON-URGENT', 'BLUE', 'No resources needed - non-urgent', '≤120 minutes'),
+}
 
 class ESITriageSystem:
     """
@@ -13,8 +61,24 @@ class ESITriageSystem:
     Following official ESI guidelines v4 for emergency department triage
     """
     
+    # Distinct (transcript, entities) inputs whose ESI level is remembered
+    LEVEL_CACHE_SIZE = 1024
+    
+    __slots__ = (
+        '_level_cache', '_level_cache_lock', '_assessment_counter',
+        'level_1_criteria', 'level_2_criteria', 'level_3_criteria', 'level_4_criteria', 'level_5_criteria',
+        'keyword_automaton', 'keyword_database', 'keyword_phrase_scopes', '_keyword_scratch',
+        'critical_vital_values', '_esi_results'
+    )
+    
     def __init__(self):
-        self._cache = {}
+        # ESI levels keyed by a digest of the normalized inputs, so transcripts aren't retained
+        self._level_cache = OrderedDict()
+        self._level_cache_lock = threading.Lock()
+        
+        # Assessment IDs only correlate log lines and results; a counter from a random
+        # start avoids a urandom call per triage while staying distinct across workers
+        self._assessment_counter = itertools.count(int.from_bytes(os.urandom(4), 'big'))
         self.setup_esi_criteria()
     
     def setup_esi_criteria(self):
@@ -104,59 +168,59 @@ class ESITriageSystem:
                 'minor complaint', 'health screening'
             ]
         }
+        
+        self.build_keyword_automaton()
+        self.build_vital_thresholds()
+        
+        # Responses only differ per level apart from ID and timestamp; copied per assessment
+        self._esi_results = {
+            level: self.esi_response_template(level, *fields)
+            for level, fields in _ESI_LEVEL_RESPONSES.items()
+        }
+    
+    def build_vital_thresholds(self):
+        """
+        Precompute, per vital matched by _VITALS_RE, the set of 1-3 digit readings
+        that are critical so each match is classified with one set lookup
+        """
+        critical_vitals = self.level_1_criteria['critical_vitals']
+        readings = range(1000)
+        
+        self.critical_vital_values = {
+            'sbp': frozenset(v for v in readings
+                             if _MIN_PLAUSIBLE_SYSTOLIC <= v < critical_vitals['systolic_bp_low']),
+            'hr': frozenset(v for v in readings
+                            if v < critical_vitals['heart_rate_low'] or v > critical_vitals['heart_rate_high']),
+            'o2': frozenset(v for v in readings if v < critical_vitals['oxygen_saturation_low']),
+            'rr': frozenset(v for v in readings
+                            if v < critical_vitals['respiratory_rate_low'] or v > critical_vitals['respiratory_rate_high']),
+        }
     
     def clear_cache(self):
-        """Clear cache to prevent result persistence"""
-        if hasattr(self, '_cache'):
-            self._cache.clear()
-        else:
-            self._cache = {}
+        """Drop remembered ESI levels, e.g. after changing criteria or for privacy"""
+        with self._level_cache_lock:
+            self._level_cache.clear()
     
     def assess_esi_level(self, entities: Dict, transcript: str) -> Dict:
         """
         Assess ESI triage level based on official ESI guidelines
         """
-        self.clear_cache()
-        
-        # ESI Algorithm Step 1: Does the patient require immediate life-saving intervention?
-        if self.check_esi_level_1(entities, transcript):
-            return self.create_esi_response(1, 'IMMEDIATE', 'RED', 
-                                          'Immediate life-saving intervention required',
-                                          '0 minutes')
-        
-        # ESI Algorithm Step 2: Is this a high-risk situation?
-        elif self.check_esi_level_2(entities, transcript):
-            return self.create_esi_response(2, 'EMERGENT', 'ORANGE',
-                                          'High-risk situation - should not wait',
-                                          '≤10 minutes')
-        
-        # ESI Algorithm Steps 3-4: How many resources will the patient consume?
-        elif self.check_esi_level_3(entities, transcript):
-            return self.create_esi_response(3, 'URGENT', 'YELLOW',
-                                          'Many resources needed - urgent care',
-                                          '≤30 minutes')
-        
-        elif self.check_esi_level_4(entities, transcript):
-            return self.create_esi_response(4, 'LESS URGENT', 'GREEN',
-                                          'One resource needed - less urgent',
-                                          '≤60 minutes')
+        level = self.determine_esi_level(entities, transcript)
+        template = self._esi_results.get(level, self._esi_results[5])
         
-        else:
-            return self.create_esi_response(5, 'NON-URGENT', 'BLUE',
-                                          'No resources needed - non-urgent',
-                                          '≤120 minutes')
+        return self.stamp_esi_response(dict(template))
     
     def create_esi_response(self, level: int, priority: str, color: str, 
                            recommendation: str, wait_time: str) -> Dict:
-
-        level_recommendations = {
-        1: 'Immediate life-saving intervention required - resuscitation team activation',
-        2: 'Immediate evaluation and intervention required; see provider within 10-15 minutes. Do not wait in general queue',
-        3: 'Urgent medical evaluation needed; multiple resources required within 30 minutes',
-        4: 'Less urgent care; single resource needed within 60 minutes',
-        5: 'Non-urgent care; routine evaluation within 2 hours'
-    }                   
         """Create standardized ESI response"""
+        return self.stamp_esi_response(
+            self.esi_response_template(level, priority, color, recommendation, wait_time)
+        )
+    
+    @staticmethod
+    def esi_response_template(level: int, priority: str, color: str,
+                              recommendation: str, wait_time: str) -> Dict:
+        """Constant fields of an ESI response; the per-assessment fields are left as None"""
         return {
             'triage_level': level,
             'priority': priority,
@@ -164,197 +228,234 @@ class ESITriageSystem:
             'recommendation': recommendation,
             'wait_time': wait_time,
             'esi_version': '4.0',
-            'assessment_id': uuid.uuid4().hex[:8],
-            'timestamp': datetime.now().isoformat(),
+            'assessment_id': None,
+            'timestamp': None,
             'confidence': 'HIGH' if level <= 2 else 'MEDIUM' if level == 3 else 'LOW'
         }
     
-    def check_esi_level_1(self, entities: Dict, transcript: str) -> bool:
+    def stamp_esi_response(self, response: Dict) -> Dict:
+        """Fill in the assessment ID and timestamp of a fresh response"""
+        response['assessment_id'] = f"{next(self._assessment_counter) & 0xFFFFFFFF:08x}"
+        response['timestamp'] = datetime.now().isoformat()
+        return response
+    
+    def build_keyword_automaton(self):
         """
-        ESI Level 1: Immediate life-saving intervention required
+        Compile every ESI keyword list into one Aho-Corasick automaton.
+        Each phrase maps to {scope: level}, where scope is the text it is
+        checked against: the transcript or a SYMPTOM/DISEASE/MEDICATION entity.
         """
-        transcript_lower = transcript.lower()
-        
-        # Check for immediate life threats in transcript
-        for threat in self.level_1_criteria['immediate_threats']:
-            if threat in transcript_lower:
-                return True
-        
-        # Check symptoms in entities
-        if 'SYMPTOM' in entities:
-            for symptom in entities['SYMPTOM']:
-                symptom_text = symptom['text'].lower()
-                for threat in self.level_1_criteria['immediate_threats']:
-                    if threat in symptom_text:
-                        return True
-        
-        # Check for critical vital signs mentioned in transcript
-        if self.check_critical_vitals(transcript_lower):
-            return True
-        
-        return False
+        keyword_scopes = [
+            (1, 'transcript', self.level_1_criteria['immediate_threats']),
+            (1, 'SYMPTOM', self.level_1_criteria['immediate_threats']),
+            (2, 'transcript', self.level_2_criteria['high_risk_symptoms']),
+            (2, 'transcript', self.level_2_criteria['high_risk_conditions']),
+            (2, 'SYMPTOM', self.level_2_criteria['high_risk_symptoms']),
+            (2, 'DISEASE', self.level_2_criteria['high_risk_conditions']),
+            (2, 'MEDICATION', self.level_2_criteria['high_risk_medications']),
+            (3, 'transcript', self.level_3_criteria['moderate_symptoms']),
+            (3, 'SYMPTOM', self.level_3_criteria['moderate_symptoms']),
+            (3, 'DISEASE', self.level_3_criteria['chronic_conditions']),
+            (4, 'transcript', self.level_4_criteria['simple_problems']),
+            (4, 'SYMPTOM', self.level_4_criteria['simple_problems']),
+            (4, 'transcript', self.level_4_criteria['single_resource']),
+        ]
+        
+        phrase_levels = {}
+        for level, scope, phrases in keyword_scopes:
+            for phrase in phrases:
+                scopes = phrase_levels.setdefault(phrase.lower(), {})
+                scopes[scope] = min(level, scopes.get(scope, level))
+        
+        self.keyword_automaton = ahocorasick.Automaton()
+        for phrase, scopes in phrase_levels.items():
+            self.keyword_automaton.add_word(phrase, scopes)
+        self.keyword_automaton.make_automaton()
+        
+        self.build_keyword_database(phrase_levels)
     
-    def check_critical_vitals(self, transcript: str) -> bool:
-        """Check for critically abnormal vital signs"""
-        # Blood pressure patterns
-        bp_pattern = r'blood pressure.*?(\d+)/(\d+)|bp.*?(\d+)/(\d+)|(\d+)/(\d+)'
-        bp_matches = re.finditer(bp_pattern, transcript)
-        
-        for match in bp_matches:
-            groups = match.groups()
-            systolic = None
-            for group in groups[:5:2]:  # Check odd indices for systolic
-                if group:
-                    try:
-                        systolic = int(group)
-                        break
-                    except:
-                        continue
-            
-            if systolic and systolic < self.level_1_criteria['critical_vitals']['systolic_bp_low']:
-                return True
-        
-        # Heart rate patterns
-        hr_pattern = r'heart rate.*?(\d+)|pulse.*?(\d+)|hr.*?(\d+)'
-        hr_matches = re.finditer(hr_pattern, transcript)
-        
-        for match in hr_matches:
-            try:
-                hr = int(match.group(1))
-                if (hr < self.level_1_criteria['critical_vitals']['heart_rate_low'] or 
-                    hr > self.level_1_criteria['critical_vitals']['heart_rate_high']):
-                    return True
-            except:
-                continue
-        
-        # Oxygen saturation patterns
-        o2_pattern = r'oxygen saturation.*?(\d+)|o2 sat.*?(\d+)|spo2.*?(\d+)'
-        o2_matches = re.finditer(o2_pattern, transcript)
-        
-        for match in o2_matches:
-            try:
-                o2_sat = int(match.group(1))
-                if o2_sat < self.level_1_criteria['critical_vitals']['oxygen_saturation_low']:
-                    return True
-            except:
-                continue
-        
-        return False
+    def build_keyword_database(self, phrase_levels: Dict[str, Dict[str, int]]):
+        """
+        Compile the same phrases into a Hyperscan database when hyperscan is installed.
+        Pattern IDs index keyword_phrase_scopes; the automaton stays as the fallback.
+        """
+        self.keyword_database = None
+        self.keyword_phrase_scopes = None
+        # Hyperscan scratch space can't be shared by concurrent scans; one per thread
+        self._keyword_scratch = threading.local()
+        if hyperscan is None:
+            return
+        
+        phrases = list(phrase_levels)
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[re.escape(phrase).encode('utf-8') for phrase in phrases],
+                ids=list(range(len(phrases))),
+                elements=len(phrases),
+                flags=0
+            )
+        except Exception as e:
+            logger.warning(f"Hyperscan keyword database unavailable, using Aho-Corasick: {e}")
+            return
+        
+        self.keyword_database = database
+        self.keyword_phrase_scopes = [phrase_levels[phrase] for phrase in phrases]
+    
+    def scan_keyword_level(self, texts: List[str], scopes: List[str]) -> int:
+        """
+        Lowest ESI level of any keyword found in texts, each checked for its scope.
+        The texts are NUL-joined and scanned in one automaton pass; no phrase contains
+        NUL, so matches never cross from one text into the next.
+        """
+        if self.keyword_database is not None:
+            return self.scan_keyword_level_hyperscan(texts, scopes)
+        
+        haystack = '\0'.join(texts)
+        # Exclusive end of each text including its separator, for mapping a match back
+        text_ends = list(itertools.accumulate(len(text) + 1 for text in texts))
+        
+        best_level = 5
+        for end_index, phrase_scopes in self.keyword_automaton.iter(haystack):
+            level = phrase_scopes.get(scopes[bisect.bisect_right(text_ends, end_index)])
+            if level is not None and level < best_level:
+                best_level = level
+                if best_level == 1:
+                    break
+        return best_level
+    
+    def scan_keyword_level_hyperscan(self, texts: List[str], scopes: List[str]) -> int:
+        """scan_keyword_level on the Hyperscan database; offsets are in UTF-8 bytes"""
+        encoded = [text.encode('utf-8') for text in texts]
+        text_ends = list(itertools.accumulate(len(text) + 1 for text in encoded))
+        phrase_scopes = self.keyword_phrase_scopes
+        best_level = [5]
+        
+        def on_match(phrase_id, start, end, flags, context):
+            level = phrase_scopes[phrase_id].get(scopes[bisect.bisect_right(text_ends, end - 1)])
+            if level is not None and level < best_level[0]:
+                best_level[0] = level
+                # Returning True stops the scan
+                return level == 1
+            return False
+        
+        scratch = getattr(self._keyword_scratch, 'scratch', None)
+        if scratch is None:
+            scratch = self._keyword_scratch.scratch = hyperscan.Scratch(self.keyword_database)
+        
+        try:
+            self.keyword_database.scan(b'\0'.join(encoded), match_event_handler=on_match, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            pass
+        return best_level[0]
     
-    def check_esi_level_2(self, entities: Dict, transcript: str) -> bool:
+    def entity_fingerprint(self, entities: Dict) -> Tuple:
         """
-        ESI Level 2: High-risk situation that shouldn't wait
+        Order-independent, hashable summary of the entity fields the ESI rules read:
+        keyword-scoped texts, plus one text-less entry per procedure since only their
+        count matters. Other labels don't affect the level and are left out of the key.
         """
+        fingerprint = [
+            (label, entity['text'].lower())
+            for label in _ENTITY_KEYWORD_SCOPES
+            for entity in entities.get(label) or ()
+        ]
+        fingerprint.extend(('PROCEDURE', '') for _ in entities.get('PROCEDURE') or ())
+        return tuple(sorted(fingerprint))
+    
+    def level_cache_key(self, transcript_lower: str, entity_fingerprint: Tuple) -> bytes:
+        """16-byte BLAKE2b digest of the normalized transcript and entity fingerprint"""
+        digest = hashlib.blake2b(transcript_lower.encode('utf-8'), digest_size=16)
+        for label, entity_text in entity_fingerprint:
+            digest.update(b'\0' + label.encode('utf-8') + b'\1' + entity_text.encode('utf-8'))
+        return digest.digest()
+    
+    def determine_esi_level(self, entities: Dict, transcript: str) -> int:
+        """Lowest ESI level whose criteria match; repeated inputs are served from the cache"""
         transcript_lower = transcript.lower()
+        entity_fingerprint = self.entity_fingerprint(entities)
+        cache_key = self.level_cache_key(transcript_lower, entity_fingerprint)
         
-        # Check high-risk symptoms in transcript
-        for symptom in self.level_2_criteria['high_risk_symptoms']:
-            if symptom in transcript_lower:
-                return True
+        with self._level_cache_lock:
+            level = self._level_cache.get(cache_key)
+            if level is not None:
+                self._level_cache.move_to_end(cache_key)
+                return level
         
-        # Check high-risk conditions
-        for condition in self.level_2_criteria['high_risk_conditions']:
-            if condition in transcript_lower:
-                return True
+        level = self._compute_esi_level(transcript_lower, entity_fingerprint)
         
-        # Check entities for high-risk symptoms
-        if 'SYMPTOM' in entities:
-            for symptom in entities['SYMPTOM']:
-                symptom_text = symptom['text'].lower()
-                for high_risk in self.level_2_criteria['high_risk_symptoms']:
-                    if high_risk in symptom_text:
-                        return True
-        
-        # Check for high-risk diseases
-        if 'DISEASE' in entities:
-            for disease in entities['DISEASE']:
-                disease_text = disease['text'].lower()
-                for high_risk in self.level_2_criteria['high_risk_conditions']:
-                    if high_risk in disease_text:
-                        return True
-        
-        # Check for high-risk medications
-        if 'MEDICATION' in entities:
-            for medication in entities['MEDICATION']:
-                med_text = medication['text'].lower()
-                for high_risk_med in self.level_2_criteria['high_risk_medications']:
-                    if high_risk_med in med_text:
-                        return True
-        
-        # Check for elderly patients (ESI considers age >65 higher risk)
-        age_pattern = r'(\d+)\s*(?:year|yr)s?\s*old|age\s*(?:is\s*)?(\d+)'
-        age_match = re.search(age_pattern, transcript_lower)
-        if age_match:
-            try:
-                age = int(age_match.group(1) or age_match.group(2))
-                if age >= self.level_2_criteria['vulnerable_populations']['age_high_risk']:
-                    # Elderly with concerning symptoms
-                    concerning_terms = ['chest pain', 'shortness of breath', 'confusion', 'fall']
-                    if any(term in transcript_lower for term in concerning_terms):
-                        return True
-            except:
-                pass
+        with self._level_cache_lock:
+            self._level_cache[cache_key] = level
+            if len(self._level_cache) > self.LEVEL_CACHE_SIZE:
+                self._level_cache.popitem(last=False)
         
-        return False
+        return level
     
-    def check_esi_level_3(self, entities: Dict, transcript: str) -> bool:
+    def _compute_esi_level(self, transcript_lower: str, entity_fingerprint: Tuple) -> int:
         """
-        ESI Level 3: Stable patient requiring multiple resources
+        Keywords are found in one automaton pass over the transcript and the relevant
+        entities; the numeric rules only run when they could still lower the level.
         """
-        transcript_lower = transcript.lower()
+        texts, scopes = [transcript_lower], ['transcript']
+        for label, entity_text in entity_fingerprint:
+            if label != 'PROCEDURE':
+                texts.append(entity_text)
+                scopes.append(label)
         
-        # Check for moderate symptoms
-        for symptom in self.level_3_criteria['moderate_symptoms']:
-            if symptom in transcript_lower:
-                return True
+        level = self.scan_keyword_level(texts, scopes)
+        
+        # Level 1: critical vital signs mentioned in transcript
+        if level > 1 and self.check_critical_vitals(transcript_lower):
+            return 1
+        
+        # Level 2: elderly patients with concerning symptoms
+        if level > 2 and self.check_high_risk_age(transcript_lower):
+            return 2
+        
+        # Level 3: multiple procedures = multiple resources
+        if level > 3 and sum(label == 'PROCEDURE' for label, _ in entity_fingerprint) >= 2:
+            return 3
         
-        # Check entities for moderate symptoms
-        if 'SYMPTOM' in entities:
-            for symptom in entities['SYMPTOM']:
-                symptom_text = symptom['text'].lower()
-                for moderate in self.level_3_criteria['moderate_symptoms']:
-                    if moderate in symptom_text:
-                        return True
-        
-        # Check for chronic conditions that may need resources
-        if 'DISEASE' in entities:
-            for disease in entities['DISEASE']:
-                disease_text = disease['text'].lower()
-                for chronic in self.level_3_criteria['chronic_conditions']:
-                    if chronic in disease_text:
-                        return True
-        
-        # Check for mentions of procedures that indicate resource needs
-        if 'PROCEDURE' in entities:
-            procedure_count = len(entities['PROCEDURE'])
-            if procedure_count >= 2:  # Multiple procedures = multiple resources
+        return level
+    
+    def check_critical_vitals(self, transcript: str) -> bool:
+        """Check for critically abnormal vital signs in one pass over the transcript"""
+        critical_vital_values = self.critical_vital_values
+        
+        for match in _VITALS_RE.finditer(transcript):
+            vital = match.lastgroup
+            if vital == 'temp':
+                # Temperatures can be decimal and in either unit, so they're compared directly
+                if self.is_critical_temperature(float(match.group(vital))):
+                    return True
+            elif int(match.group(vital)) in critical_vital_values[vital]:
                 return True
         
         return False
     
-    def check_esi_level_4(self, entities: Dict, transcript: str) -> bool:
+    def is_critical_temperature(self, value: float) -> bool:
         """
-        ESI Level 4: One resource needed
+        The unit is inferred from the plausible body temperature range the reading falls
+        in. Anything outside both, e.g. a misheard or partial number, is not treated as a
+        temperature. The threshold is in Fahrenheit.
         """
-        transcript_lower = transcript.lower()
-        
-        # Check for simple problems
-        for problem in self.level_4_criteria['simple_problems']:
-            if problem in transcript_lower:
-                return True
-        
-        # Check entities for simple symptoms
-        if 'SYMPTOM' in entities:
-            for symptom in entities['SYMPTOM']:
-                symptom_text = symptom['text'].lower()
-                for simple in self.level_4_criteria['simple_problems']:
-                    if simple in symptom_text:
-                        return True
-        
-        # Check for single resource indicators
-        for resource in self.level_4_criteria['single_resource']:
-            if resource in transcript_lower:
-                return True
+        if _CELSIUS_RANGE[0] <= value <= _CELSIUS_RANGE[1]:
+            fahrenheit = value * 9 / 5 + 32
+        elif _FAHRENHEIT_RANGE[0] <= value <= _FAHRENHEIT_RANGE[1]:
+            fahrenheit = value
+        else:
+            return False
+        return fahrenheit >= self.level_1_criteria['critical_vitals']['temperature_high']
+    
+    def check_high_risk_age(self, transcript_lower: str) -> bool:
+        """ESI considers age >65 higher risk when combined with concerning symptoms"""
+        age_match = _AGE_RE.search(transcript_lower)
+        if age_match:
+            age = int(age_match.group(1) or age_match.group(2))
+            if age >= self.level_2_criteria['vulnerable_populations']['age_high_risk']:
+                # Elderly with concerning symptoms
+                if any(term in transcript_lower for term in _ELDERLY_CONCERNING_TERMS):
+                    return True
         
         return False
 
@@ -363,27 +464,44 @@ class HybridTriageSystem:
     Simple wrapper that uses only ESI-based triage (no ML)
     """
     
+    __slots__ = ('esi_system', 'logger')
+    
     def __init__(self):
         self.esi_system = ESITriageSystem()
+        self.logger = logger
+    
+    @staticmethod
+    def debug_hash(entities: Dict) -> str:
+        """Short BLAKE2b fingerprint of entity labels and texts, built without repr(entities)"""
+        digest = hashlib.blake2b(digest_size=4)
+        for label, label_entities in entities.items():
+            digest.update(label.encode('utf-8'))
+            for entity in label_entities:
+                digest.update(b'\0' + entity['text'].encode('utf-8'))
+        return digest.hexdigest()
     
     def comprehensive_triage(self, entities: Dict, transcript: str) -> Dict:
         """
         Perform triage assessment using pure ESI guidelines
         """
         
-        # Debug: Log inputs to verify different data is being processed
-        entities_hash = hashlib.md5(str(entities).encode()).hexdigest()[:8]
-        transcript_hash = hashlib.md5(transcript.encode()).hexdigest()[:8]
-        
-        print(f"🔍 ESI TRIAGE DEBUG: Entities hash: {entities_hash}")
-        print(f"🔍 ESI TRIAGE DEBUG: Transcript hash: {transcript_hash}")
+        # Debug: Log inputs to verify different data is being processed.
+        # Only fingerprinted when debug logging is on; BLAKE2b keeps hashes comparable across workers.
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            entities_hash = self.debug_hash(entities)
+            transcript_hash = hashlib.blake2b(transcript.encode('utf-8'), digest_size=4).hexdigest()
+            
+            self.logger.debug(f"🔍 ESI TRIAGE DEBUG: Entities hash: {entities_hash}")
+            self.logger.debug(f"🔍 ESI TRIAGE DEBUG: Transcript hash: {transcript_hash}")
         
         # Get ESI assessment
         esi_result = self.esi_system.assess_esi_level(entities, transcript)
         
-        print(f"🔍 ESI TRIAGE DEBUG: Assessment ID: {esi_result['assessment_id']}")
-        print(f"🔍 ESI TRIAGE DEBUG: ESI Level: {esi_result['triage_level']}")
-        print(f"🔍 ESI TRIAGE DEBUG: Priority: {esi_result['priority']}")
+        if debug_enabled:
+            self.logger.debug(f"🔍 ESI TRIAGE DEBUG: Assessment ID: {esi_result['assessment_id']}")
+            self.logger.debug(f"🔍 ESI TRIAGE DEBUG: ESI Level: {esi_result['triage_level']}")
+            self.logger.debug(f"🔍 ESI TRIAGE DEBUG: Priority: {esi_result['priority']}")
         
         return esi_result
 
@@ -393,18 +511,15 @@ class MedicalTriageSystem:
     ESI-based medical triage system (replaces the old rule-based system)
     """
     
+    __slots__ = ('esi_system',)
+    
     def __init__(self):
-        self._cache = {}
         self.esi_system = ESITriageSystem()
     
     def clear_cache(self):
-        """Clear cache to prevent result persistence"""
-        if hasattr(self, '_cache'):
-            self._cache.clear()
-        else:
-            self._cache = {}
+        """Drop remembered ESI levels, e.g. after changing criteria or for privacy"""
+        self.esi_system.clear_cache()
     
     def assess_triage_level(self, entities: Dict, transcript: str) -> Dict:
         """Assess triage level using ESI guidelines"""
-        self.clear_cache()
         return self.esi_system.assess_esi_level(entities, transcript)